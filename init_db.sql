@@ -122,24 +122,27 @@ CREATE TABLE activity_log (
 );
 
 -- Create indexes for better performance
+-- (group_memberships(group_id, user_id) and expense_splits(expense_id, user_id)
+-- are already indexed by their UNIQUE constraints, which also serve lookups
+-- on group_id and expense_id alone)
 CREATE INDEX idx_users_email ON users(email) WHERE email IS NOT NULL;
 CREATE INDEX idx_users_active ON users(is_active) WHERE is_active = TRUE;
 
 CREATE INDEX idx_groups_created_by ON groups(created_by);
 CREATE INDEX idx_groups_active ON groups(is_active) WHERE is_active = TRUE;
 
-CREATE INDEX idx_group_memberships_group_id ON group_memberships(group_id);
 CREATE INDEX idx_group_memberships_user_id ON group_memberships(user_id);
 CREATE INDEX idx_group_memberships_active ON group_memberships(is_active) WHERE is_active = TRUE;
 
 CREATE INDEX idx_expenses_paid_by ON expenses(paid_by);
-CREATE INDEX idx_expenses_group_id ON expenses(group_id) WHERE group_id IS NOT NULL;
+CREATE INDEX idx_expenses_group_created_at ON expenses(group_id, created_at DESC) WHERE group_id IS NOT NULL;
 CREATE INDEX idx_expenses_date ON expenses(expense_date);
 CREATE INDEX idx_expenses_created_at ON expenses(created_at);
 CREATE INDEX idx_expenses_active ON expenses(is_deleted) WHERE is_deleted = FALSE;
 CREATE INDEX idx_expenses_category ON expenses(category);
+CREATE INDEX idx_expenses_group_category ON expenses(group_id, category) INCLUDE (amount) WHERE is_deleted = FALSE;
+CREATE INDEX idx_expenses_group_paid_by ON expenses(group_id, paid_by) INCLUDE (amount) WHERE is_deleted = FALSE;
 
-CREATE INDEX idx_expense_splits_expense_id ON expense_splits(expense_id);
 CREATE INDEX idx_expense_splits_user_id ON expense_splits(user_id);
 
 CREATE INDEX idx_settlements_from_user ON settlements(from_user_id);
@@ -270,6 +273,16 @@ LEFT JOIN expenses e ON g.id = e.group_id AND e.is_deleted = FALSE
 WHERE g.is_active = TRUE
 GROUP BY g.id, g.name, g.description, g.created_by, g.created_at;
 
+-- View for per-group category totals (served by idx_expenses_group_category)
+CREATE VIEW group_category_totals AS
+SELECT 
+    group_id,
+    category,
+    SUM(amount) as total_amount
+FROM expenses
+WHERE is_deleted = FALSE AND group_id IS NOT NULL
+GROUP BY group_id, category;
+
 -- Insert some sample data (optional - remove if not needed)
 /*
 -- Sample users
@@ -289,6 +302,9 @@ FROM groups g, users u
 WHERE g.name = 'Roommates' AND u.name IN ('Bob Smith', 'Charlie Brown');
 */
 
+-- Refresh planner statistics so the indexes above are used from the start
+ANALYZE;
+
 -- Grant permissions (adjust as needed for your application user)
 -- GRANT SELECT, INSERT, UPDATE, DELETE ON ALL TABLES IN SCHEMA public TO your_app_user;
 -- GRANT USAGE, SELECT ON ALL SEQUENCES IN SCHEMA public TO your_app_user;
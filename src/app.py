@@ -1,7 +1,8 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import plotly.express as px
 import plotly.graph_objects as go
 
@@ -16,15 +17,72 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Shared application state, created once per server process
+@st.cache_resource
+def get_app() -> ExpenseSplitter:
+    return ExpenseSplitter()
+
 # Initialize session state
-if 'app' not in st.session_state:
-    st.session_state.app = ExpenseSplitter()
 if 'current_user' not in st.session_state:
     st.session_state.current_user = None
 if 'selected_group' not in st.session_state:
     st.session_state.selected_group = None
 
-app = st.session_state.app
+app = get_app()
+
+# Cached queries: keyed on app.version so any change to the data invalidates them
+@st.cache_data(ttl=30)
+def cached_user_expenses(_app: ExpenseSplitter, user_id: str, version: int, limit: Optional[int] = None) -> List[Expense]:
+    return _app.get_user_expenses(user_id, limit)
+
+@st.cache_data(ttl=30)
+def cached_member_names(_app: ExpenseSplitter, group_id: str, version: int) -> List[str]:
+    return [_app.get_user(uid).name for uid in _app.groups[group_id].members]
+
+@st.cache_data(ttl=30)
+def cached_user_totals(_app: ExpenseSplitter, user_id: str, version: int) -> Tuple[int, float]:
+    return _app.count_user_expenses(user_id), _app.get_total_paid(user_id)
+
+@st.cache_data(ttl=30)
+def cached_user_balance(_app: ExpenseSplitter, user_id: str, group_id: str, version: int) -> Dict[str, float]:
+    return _app.calculate_user_balance(user_id, group_id)
+
+@st.cache_data(ttl=30)
+def cached_group_balances(_app: ExpenseSplitter, group_id: str, version: int) -> Dict[str, Dict[str, float]]:
+    return _app.get_group_balances(group_id)
+
+@st.cache_data(ttl=30)
+def cached_settlements(_app: ExpenseSplitter, group_id: str, version: int) -> List[Dict]:
+    return _app.simplify_debts(cached_group_balances(_app, group_id, version))
+
+# Cached chart builders: keyed on the aggregated data, so reruns that don't change it skip figure construction
+@st.cache_data(ttl=60)
+def category_pie(category_data: pd.Series) -> go.Figure:
+    return px.pie(
+        values=category_data.values,
+        names=category_data.index,
+        title="Expense Distribution by Category"
+    )
+
+@st.cache_data(ttl=60)
+def member_bar(member_data: pd.Series) -> go.Figure:
+    fig_bar = px.bar(
+        x=member_data.index,
+        y=member_data.values,
+        title="Total Paid by Each Member"
+    )
+    fig_bar.update_layout(xaxis_title="Member", yaxis_title="Amount ($)")
+    return fig_bar
+
+@st.cache_data(ttl=60)
+def timeline_line(df_timeline: pd.DataFrame) -> go.Figure:
+    return px.line(
+        df_timeline, 
+        x="Date", 
+        y="Amount",
+        title="Expense Timeline",
+        hover_data=["Description"]
+    )
 
 # Custom CSS for better styling
 st.markdown("""
@@ -96,13 +154,13 @@ with st.sidebar:
                       if st.session_state.current_user.id in group.members]
         
         if user_groups:
-            group_names = [group.name for group in user_groups]
-            selected_group_name = st.selectbox("Select Group", ["None"] + group_names)
+            groups_by_name = {}
+            for group in user_groups:
+                groups_by_name.setdefault(group.name, group)
+            selected_group_name = st.selectbox("Select Group", ["None"] + list(groups_by_name))
             
             if selected_group_name != "None":
-                st.session_state.selected_group = next(
-                    group for group in user_groups if group.name == selected_group_name
-                )
+                st.session_state.selected_group = groups_by_name[selected_group_name]
             else:
                 st.session_state.selected_group = None
         else:
@@ -129,9 +187,7 @@ with tab1:
     col1, col2, col3 = st.columns(3)
     
     # User statistics
-    user_expenses = app.get_user_expenses(current_user.id)
-    total_expenses = len(user_expenses)
-    total_paid = sum(exp.amount for exp in user_expenses if exp.paid_by == current_user.id)
+    total_expenses, total_paid = cached_user_totals(app, current_user.id, app.version)
     
     with col1:
         st.metric("Total Expenses", total_expenses)
@@ -139,16 +195,17 @@ with tab1:
         st.metric("Total Paid", f"${total_paid:.2f}")
     with col3:
         if st.session_state.selected_group:
-            balances = app.calculate_user_balance(current_user.id, st.session_state.selected_group.id)
+            balances = cached_user_balance(app, current_user.id, st.session_state.selected_group.id, app.version)
             net_balance = sum(balances.values())
             st.metric("Net Balance", f"${net_balance:.2f}", 
                      delta_color="normal" if net_balance >= 0 else "inverse")
     
     # Recent expenses
     st.subheader("📋 Recent Expenses")
-    if user_expenses:
+    recent_expenses = cached_user_expenses(app, current_user.id, app.version, limit=10)
+    if recent_expenses:
         expenses_data = []
-        for exp in user_expenses[:10]:  # Show last 10 expenses
+        for exp in recent_expenses:
             expenses_data.append({
                 "Date": exp.created_at.strftime("%Y-%m-%d"),
                 "Description": exp.description,
@@ -166,22 +223,24 @@ with tab1:
     # Current balances
     if st.session_state.selected_group:
         st.subheader("💰 Current Balances")
-        balances = app.calculate_user_balance(current_user.id, st.session_state.selected_group.id)
+        balances = cached_user_balance(app, current_user.id, st.session_state.selected_group.id, app.version)
         
         if balances:
-            balance_data = []
-            for user_id, amount in balances.items():
-                user = app.get_user(user_id)
-                if amount > 0:
-                    balance_data.append({"Person": user.name, "Status": f"Owes you ${amount:.2f}", "Type": "positive"})
-                elif amount < 0:
-                    balance_data.append({"Person": user.name, "Status": f"You owe ${abs(amount):.2f}", "Type": "negative"})
+            # Split creditors and debtors with vector masks and show each side as one table
+            amounts = np.fromiter(balances.values(), dtype=np.float64, count=len(balances))
+            names = np.array([app.get_user(user_id).name for user_id in balances])
+            owes_you = amounts > 0
+            you_owe = amounts < 0
+            amount_column = {"Amount": st.column_config.NumberColumn(format="$%.2f")}
             
-            for item in balance_data:
-                if item["Type"] == "positive":
-                    st.markdown(f'<p class="balance-positive">✅ {item["Person"]} {item["Status"]}</p>', unsafe_allow_html=True)
-                else:
-                    st.markdown(f'<p class="balance-negative">❌ {item["Person"]} - {item["Status"]}</p>', unsafe_allow_html=True)
+            if owes_you.any():
+                st.markdown('<p class="balance-positive">✅ Owes you</p>', unsafe_allow_html=True)
+                st.dataframe(pd.DataFrame({"Person": names[owes_you], "Amount": amounts[owes_you]}),
+                             column_config=amount_column, hide_index=True, use_container_width=True)
+            if you_owe.any():
+                st.markdown('<p class="balance-negative">❌ You owe</p>', unsafe_allow_html=True)
+                st.dataframe(pd.DataFrame({"Person": names[you_owe], "Amount": -amounts[you_owe]}),
+                             column_config=amount_column, hide_index=True, use_container_width=True)
         else:
             st.success("🎉 All settled up!")
 
@@ -189,6 +248,10 @@ with tab1:
 with tab2:
     st.header("💸 Add New Expense")
     
+    group_members = []
+    if st.session_state.selected_group:
+        group_members = cached_member_names(app, st.session_state.selected_group.id, app.version)
+    
     with st.form("add_expense_form"):
         col1, col2 = st.columns(2)
         
@@ -202,10 +265,6 @@ with tab2:
         
         with col2:
             # Paid by selection
-            group_members = []
-            if st.session_state.selected_group:
-                group_members = [app.get_user(uid).name for uid in st.session_state.selected_group.members]
-            
             paid_by_name = st.selectbox("Paid by*", group_members if group_members else [current_user.name])
             
             # Split type
@@ -228,19 +287,19 @@ with tab2:
             
             elif split_type == "Exact":
                 st.write("Enter exact amounts for each person:")
-                exact_amounts = {}
-                remaining = amount
-                
-                for member in group_members:
-                    member_amount = st.number_input(
-                        f"{member}", 
-                        min_value=0.0, 
-                        max_value=float(remaining), 
-                        step=0.01, 
-                        key=f"exact_{member}"
-                    )
-                    exact_amounts[member] = member_amount
-                    remaining -= member_amount
+                # A single editable table instead of one number_input per member
+                exact_df = st.data_editor(
+                    pd.DataFrame({"Member": group_members, "Amount": 0.0}),
+                    column_config={
+                        "Member": st.column_config.TextColumn(disabled=True),
+                        "Amount": st.column_config.NumberColumn(min_value=0.0, step=0.01, format="%.2f")
+                    },
+                    hide_index=True,
+                    use_container_width=True,
+                    key=f"exact_{st.session_state.selected_group.id}"
+                )
+                exact_amounts = dict(zip(exact_df["Member"], exact_df["Amount"].fillna(0.0).tolist()))
+                remaining = amount - sum(exact_amounts.values())
                 
                 if remaining < -0.01:
                     st.error(f"Total splits exceed expense amount by ${abs(remaining):.2f}")
@@ -249,19 +308,18 @@ with tab2:
             
             elif split_type == "Percentage":
                 st.write("Enter percentages for each person:")
-                percentages = {}
-                total_percentage = 0
-                
-                for member in group_members:
-                    member_percentage = st.number_input(
-                        f"{member} (%)", 
-                        min_value=0.0, 
-                        max_value=100.0, 
-                        step=0.1, 
-                        key=f"percentage_{member}"
-                    )
-                    percentages[member] = member_percentage
-                    total_percentage += member_percentage
+                percentage_df = st.data_editor(
+                    pd.DataFrame({"Member": group_members, "Percentage": 0.0}),
+                    column_config={
+                        "Member": st.column_config.TextColumn(disabled=True),
+                        "Percentage": st.column_config.NumberColumn(min_value=0.0, max_value=100.0, step=0.1)
+                    },
+                    hide_index=True,
+                    use_container_width=True,
+                    key=f"percentage_{st.session_state.selected_group.id}"
+                )
+                percentages = dict(zip(percentage_df["Member"], percentage_df["Percentage"].fillna(0.0).tolist()))
+                total_percentage = sum(percentages.values())
                 
                 if abs(total_percentage - 100) > 0.1:
                     st.error(f"Percentages must sum to 100%. Current total: {total_percentage}%")
@@ -377,62 +435,39 @@ with tab4:
         group_expenses = app.get_group_expenses(group.id)
         
         if group_expenses:
+            # One DataFrame per render; every chart below is a vectorized aggregate of it
+            df_expenses = pd.DataFrame(
+                [(e.category, e.paid_by, e.amount, e.created_at, e.description) for e in group_expenses],
+                columns=["category", "paid_by", "amount", "created_at", "description"]
+            )
+            
             # Expense breakdown by category
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("💰 Expenses by Category")
-                category_data = {}
-                for expense in group_expenses:
-                    category = expense.category
-                    if category not in category_data:
-                        category_data[category] = 0
-                    category_data[category] += expense.amount
-                
-                fig_pie = px.pie(
-                    values=list(category_data.values()),
-                    names=list(category_data.keys()),
-                    title="Expense Distribution by Category"
-                )
-                st.plotly_chart(fig_pie, use_container_width=True)
+                category_data = df_expenses.groupby("category", sort=False)["amount"].sum()
+                st.plotly_chart(category_pie(category_data), use_container_width=True)
             
             with col2:
                 st.subheader("📊 Expenses by Member")
-                member_data = {}
-                for expense in group_expenses:
-                    payer = app.get_user(expense.paid_by).name
-                    if payer not in member_data:
-                        member_data[payer] = 0
-                    member_data[payer] += expense.amount
-                
-                fig_bar = px.bar(
-                    x=list(member_data.keys()),
-                    y=list(member_data.values()),
-                    title="Total Paid by Each Member"
-                )
-                fig_bar.update_layout(xaxis_title="Member", yaxis_title="Amount ($)")
-                st.plotly_chart(fig_bar, use_container_width=True)
+                member_data = df_expenses.groupby("paid_by", sort=False)["amount"].sum()
+                # Members who share a name get one bar, as they did when totals were keyed by name
+                member_data = member_data.rename(index=lambda uid: app.get_user(uid).name)
+                member_data = member_data.groupby(level=0, sort=False).sum()
+                st.plotly_chart(member_bar(member_data), use_container_width=True)
             
             # Expense timeline
             st.subheader("📅 Expense Timeline")
-            timeline_data = []
-            for expense in sorted(group_expenses, key=lambda x: x.created_at):
-                timeline_data.append({
-                    "Date": expense.created_at.strftime("%Y-%m-%d"),
-                    "Amount": expense.amount,
-                    "Description": expense.description
-                })
+            df_timeline = df_expenses.iloc[::-1]  # group_expenses is newest first
+            df_timeline = pd.DataFrame({
+                "Date": df_timeline["created_at"].dt.strftime("%Y-%m-%d"),
+                "Amount": df_timeline["amount"],
+                "Description": df_timeline["description"]
+            })
             
-            if timeline_data:
-                df_timeline = pd.DataFrame(timeline_data)
-                fig_timeline = px.line(
-                    df_timeline, 
-                    x="Date", 
-                    y="Amount",
-                    title="Expense Timeline",
-                    hover_data=["Description"]
-                )
-                st.plotly_chart(fig_timeline, use_container_width=True)
+            if not df_timeline.empty:
+                st.plotly_chart(timeline_line(df_timeline), use_container_width=True)
         
         else:
             st.info("No expenses found for this group yet!")
@@ -449,8 +484,7 @@ with tab5:
         
         # Show simplified transactions
         st.subheader("💸 Suggested Settlements")
-        group_balances = app.get_group_balances(group.id)
-        simplified_transactions = app.simplify_debts(group_balances)
+        simplified_transactions = cached_settlements(app, group.id, app.version)
         
         if simplified_transactions:
             for i, transaction in enumerate(simplified_transactions):
@@ -470,10 +504,10 @@ with tab5:
         
         # Detailed balances
         st.subheader("📋 Detailed Balances")
+        group_balances = cached_group_balances(app, group.id, app.version)
         
-        for member_id in group.members:
+        for member_id, balances in group_balances.items():
             member = app.get_user(member_id)
-            balances = app.calculate_user_balance(member_id, group.id)
             
             if balances:
                 st.write(f"**{member.name}:**")
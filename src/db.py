@@ -1,37 +1,56 @@
-import psycopg2
+import atexit
+from contextlib import contextmanager
+
 from psycopg2 import sql
+from psycopg2.pool import ThreadedConnectionPool
+
+DB_CONFIG = {
+    'dbname': 'expense_tracker',
+    'user': 'liauzhanyi',
+    # 'password': '',
+    'host': 'localhost',
+    'port': '5432',
+}
 
-def get_db_connection():
-    """Establish a connection to the PostgreSQL database."""
+def _create_pool(minconn=1, maxconn=16):
+    """Create the shared connection pool, or return None if the database is unreachable."""
     try:
-        conn = psycopg2.connect(
-            dbname='expense_tracker',
-            user='liauzhanyi',
-            # password='',
-            host='localhost',
-            port='5432'
-        )
-        return conn
+        pool = ThreadedConnectionPool(minconn, maxconn, **DB_CONFIG)
+        atexit.register(pool.closeall)
+        return pool
     except Exception as e:
         print(f"Error connecting to the database: {e}")
         return None
 
+_POOL = _create_pool()
+
+@contextmanager
+def borrow():
+    """Borrow a connection from the pool, rolling back on error and returning it when done."""
+    if _POOL is None:
+        raise RuntimeError("Database connection pool is not available")
+    conn = _POOL.getconn()
+    try:
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        _POOL.putconn(conn)
+
 def execute_sql_script(script_path):
-    """Execute a SQL script from a file."""
-    conn = get_db_connection()
-    if conn is None:
+    """Execute a SQL script from a file in a single round trip and transaction."""
+    if _POOL is None:
         return
 
     try:
-        with open(script_path, 'r') as sql_file:
+        with borrow() as conn, open(script_path, 'r') as sql_file:
             cursor = conn.cursor()
             cursor.execute(sql_file.read())
             conn.commit()
             print(f"Executed script: {script_path}")
     except Exception as e:
         print(f"Error executing script {script_path}: {e}")
-    finally:
-        conn.close()
 
 def init_db(script_path='../init_db.sql'):
     """Initialize the database by executing the SQL script."""
@@ -1,75 +1,239 @@
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import DefaultDict, Dict, List, Optional, Set, Tuple
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import wraps
+from operator import attrgetter
+import heapq
+import sys
+import threading
+import time
 import uuid
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; balances fall back to plain NumPy
+    njit = None
+
 class SplitType(Enum):
     EQUAL = "equal"
     EXACT = "exact"
     PERCENTAGE = "percentage"
 
 
-@dataclass
+def _new_id() -> str:
+    # Interned, so the id comparisons in the balance and index code can short-circuit on identity
+    return sys.intern(str(uuid.uuid4()))
+
+
+@dataclass(slots=True)
 class User:
     """Represents a user in the expense splitting system"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     name: str = ""
     email: str = ""
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at_ns: int = field(default_factory=time.time_ns)
     
     def __post_init__(self):
         if not self.name:
             raise ValueError("User name cannot be empty")
+    
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at_ns / 1e9)
 
 
-@dataclass
+@dataclass(slots=True)
 class Split:
     """Represents how an expense is split among users"""
     user_id: str
-    amount: float = 0.0
+    amount_cents: int = 0
     percentage: float = 0.0
     
     def __post_init__(self):
-        if self.amount < 0:
+        if self.amount_cents < 0:
             raise ValueError("Split amount cannot be negative")
         if not (0 <= self.percentage <= 100):
             self.percentage = 0
+    
+    @property
+    def amount(self) -> float:
+        return _from_cents(self.amount_cents)
 
 
-@dataclass
+@dataclass(slots=True)
 class Expense:
     """Represents a shared expense"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     description: str = ""
-    amount: float = 0.0
+    amount_cents: int = 0
     paid_by: str = ""  # user_id who paid
     group_id: Optional[str] = None
     split_type: SplitType = SplitType.EQUAL
-    splits: List[Split] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.now)
+    # Splits are held column-wise, one entry per participant; the splits property builds Split objects from them
+    split_user_ids: Tuple[str, ...] = ()
+    split_cents: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64), compare=False)
+    split_percentages: np.ndarray = field(default_factory=lambda: np.zeros(0), compare=False)
+    created_at_ns: int = field(default_factory=time.time_ns)
     category: str = "General"
     
     def __post_init__(self):
-        if self.amount <= 0:
+        if self.amount_cents <= 0:
             raise ValueError("Expense amount must be positive")
         if not self.description:
             raise ValueError("Expense description cannot be empty")
+    
+    @property
+    def amount(self) -> float:
+        return _from_cents(self.amount_cents)
+    
+    @property
+    def splits(self) -> List[Split]:
+        return [Split(user_id=uid, amount_cents=cents, percentage=percentage)
+                for uid, cents, percentage in zip(self.split_user_ids, self.split_cents.tolist(),
+                                                  self.split_percentages.tolist())]
+    
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at_ns / 1e9)
 
 
-@dataclass
+@dataclass(slots=True)
 class Group:
     """Represents a group of users who share expenses"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     name: str = ""
     description: str = ""
-    members: List[str] = field(default_factory=list)  # user_ids
+    members: Dict[str, None] = field(default_factory=dict)  # user_ids, as an insertion-ordered set
     created_by: str = ""  # user_id
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at_ns: int = field(default_factory=time.time_ns)
     
     def __post_init__(self):
         if not self.name:
             raise ValueError("Group name cannot be empty")
+    
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at_ns / 1e9)
+
+
+# Amounts are held as integer cents internally; floats only appear at the API boundary
+def _to_cents(amount: float) -> int:
+    return int(round(amount * 100))
+
+
+def _from_cents(cents: int) -> float:
+    return cents / 100
+
+
+def _allocate_cents(total_cents: int, weights: np.ndarray) -> List[int]:
+    """Split total_cents in proportion to weights, giving leftover cents to the largest remainders"""
+    exact = total_cents * weights / weights.sum()
+    shares = np.floor(exact).astype(np.int64)
+    leftover = total_cents - int(shares.sum())
+    shares[np.argsort(shares - exact, kind="stable")[:leftover]] += 1
+    return shares.tolist()
+
+
+def _newest_first(expenses: List[Expense], limit: Optional[int] = None, offset: int = 0) -> List[Expense]:
+    """Order expenses newest first, selecting only the requested window with a bounded heap when limited"""
+    key = attrgetter('created_at_ns')
+    if limit is None:
+        return sorted(expenses, key=key, reverse=True)[offset:]
+    return heapq.nlargest(offset + limit, expenses, key=key)[offset:]
+
+
+_ALL_GROUPS = -3  # group filter for _user_net_cents that matches every split
+
+
+def _user_net_cents_numpy(split_user, split_payer, split_group, split_cents, uid, group, n_users):
+    """Net cents between one user and each other user, with a mask of the users they share splits with"""
+    # Compare each column against this user once and derive both sides from the same masks
+    is_mine = split_user == uid
+    paid_by_me = split_payer == uid
+    if group != _ALL_GROUPS:
+        in_scope = split_group == group
+        is_mine &= in_scope
+        paid_by_me &= in_scope
+    
+    # Splits of expenses this user paid: each other participant owes them their share
+    owed_to_me = paid_by_me & ~is_mine
+    # This user's own shares of expenses someone else paid
+    i_owe = is_mine & ~paid_by_me & (split_cents > 0)
+    
+    net = (np.bincount(split_user[owed_to_me], weights=split_cents[owed_to_me], minlength=n_users)
+           - np.bincount(split_payer[i_owe], weights=split_cents[i_owe], minlength=n_users)).astype(np.int64)
+    involved = np.zeros(n_users, dtype=np.bool_)
+    involved[split_user[owed_to_me]] = True
+    involved[split_payer[i_owe]] = True
+    return net, involved
+
+
+def _user_net_cents_loop(split_user, split_payer, split_group, split_cents, uid, group, n_users):
+    """Same result as _user_net_cents_numpy in one pass over the splits, for compiling with Numba"""
+    net = np.zeros(n_users, dtype=np.int64)
+    involved = np.zeros(n_users, dtype=np.bool_)
+    for k in range(len(split_cents)):
+        if group != _ALL_GROUPS and split_group[k] != group:
+            continue
+        user = split_user[k]
+        payer = split_payer[k]
+        if payer == uid and user != uid:
+            net[user] += split_cents[k]
+            involved[user] = True
+        elif user == uid and payer != uid and split_cents[k] > 0:
+            net[payer] -= split_cents[k]
+            involved[payer] = True
+    return net, involved
+
+
+# Compiled on first use (and cached on disk) when Numba is installed
+_user_net_cents = njit(cache=True)(_user_net_cents_loop) if njit is not None else _user_net_cents_numpy
+
+
+_SIMPLIFY_CACHE_SIZE = 128
+
+
+def _settle(net_balances: Tuple[Tuple[str, int], ...]) -> List[Tuple[str, str, int]]:
+    """Payments (debtor, creditor, cents) that clear the given net balances"""
+    # Creditors and debtors, largest balance first
+    creditors = sorted(((uid, amount) for uid, amount in net_balances if amount > 0),
+                       key=lambda x: x[1], reverse=True)
+    debtors = sorted(((uid, -amount) for uid, amount in net_balances if amount < 0),
+                     key=lambda x: x[1], reverse=True)
+    credit_left = [amount for _, amount in creditors]
+    debt_left = [amount for _, amount in debtors]
+    
+    payments = []
+    
+    # Walk both lists once, settling the current debtor against the current creditor
+    # and advancing whichever of the two is paid off
+    i = j = 0
+    while i < len(creditors) and j < len(debtors):
+        payment = min(credit_left[i], debt_left[j])
+    
+        payments.append((debtors[j][0], creditors[i][0], payment))
+    
+        credit_left[i] -= payment
+        debt_left[j] -= payment
+        if credit_left[i] == 0:
+            i += 1
+        if debt_left[j] == 0:
+            j += 1
+    
+    return payments
+
+
+def _synchronized(method):
+    """Run an ExpenseSplitter method while holding the instance lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class ExpenseSplitter:
@@ -79,12 +243,60 @@ class ExpenseSplitter:
         self.users: Dict[str, User] = {}
         self.groups: Dict[str, Group] = {}
         self.expenses: Dict[str, Expense] = {}
+        self._users_by_name: Dict[str, User] = {}  # lowercased name -> first user with that name
+        # Dense integer indices for the NumPy split arrays built by _split_arrays
+        self.user_ids: List[str] = []
+        self._user_index: Dict[str, int] = {}
+        self._group_index: Dict[str, int] = {}
+        self._split_soa: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] = ()
+        self._split_arrays_version = -1
+        # Expense ids by payer, by group and by split participant, so per-user and
+        # per-group queries only touch the expenses they return
+        self._expenses_by_payer: Dict[str, List[str]] = {}
+        self._expenses_by_group: Dict[Optional[str], List[str]] = {}
+        self._expenses_by_participant: Dict[str, Set[str]] = {}
+        # Memoized get_group_balances results as (member, ((other user, cents), ...)) tuples,
+        # dropped whenever the group changes
+        self._group_balance_cache: Dict[str, Tuple[Tuple[str, Tuple[Tuple[str, int], ...]], ...]] = {}
+        # Settlements by net balances in cents, least recently used evicted first
+        self._simplify_cache: OrderedDict[Tuple[Tuple[str, int], ...], List[Tuple[str, str, int]]] = OrderedDict()
+        self.version = 0  # bumped on every change so callers can invalidate caches
+        # One instance can be shared by several threads (e.g. every Streamlit session), so
+        # mutators and cache fills hold this lock
+        self._lock = threading.RLock()
+    
+    def _mark_changed(self, group_id: Optional[str] = None):
+        """Record a change to the data, invalidating cached results that depend on it"""
+        self.version += 1
+        self._group_balance_cache.pop(group_id, None)
+    
+    def _set_splits(self, expense: Expense, split_type: SplitType, user_ids: List[str],
+                    cents: np.ndarray, percentages: Optional[np.ndarray] = None):
+        """Replace an expense's splits, keeping the participant index in step"""
+        cents = np.asarray(cents, dtype=np.int64)
+        if (cents < 0).any():
+            raise ValueError("Split amount cannot be negative")
+        
+        for uid in expense.split_user_ids:
+            self._expenses_by_participant[uid].discard(expense.id)
+        expense.split_type = split_type
+        expense.split_user_ids = tuple(user_ids)
+        expense.split_cents = cents
+        expense.split_percentages = np.zeros(len(cents)) if percentages is None else percentages
+        for uid in expense.split_user_ids:
+            self._expenses_by_participant.setdefault(uid, set()).add(expense.id)
+        self._mark_changed(expense.group_id)
     
     # User Management
+    @_synchronized
     def create_user(self, name: str, email: str = "") -> User:
         """Create a new user"""
         user = User(name=name, email=email)
         self.users[user.id] = user
+        self._users_by_name.setdefault(user.name.lower(), user)
+        self._user_index[user.id] = len(self.user_ids)
+        self.user_ids.append(user.id)
+        self._mark_changed()
         return user
     
     def get_user(self, user_id: str) -> Optional[User]:
@@ -92,23 +304,24 @@ class ExpenseSplitter:
         return self.users.get(user_id)
     
     def get_user_by_name(self, name: str) -> Optional[User]:
-        """Get user by name"""
-        for user in self.users.values():
-            if user.name.lower() == name.lower():
-                return user
-        return None
+        """Get user by name (case-insensitive)"""
+        return self._users_by_name.get(name.lower())
     
     # Group Management
+    @_synchronized
     def create_group(self, name: str, created_by: str, description: str = "") -> Group:
         """Create a new group"""
         if created_by not in self.users:
             raise ValueError("Creator must be a valid user")
         
         group = Group(name=name, description=description, created_by=created_by)
-        group.members.append(created_by)  # Creator is automatically a member
+        group.members[created_by] = None  # Creator is automatically a member
         self.groups[group.id] = group
+        self._group_index[group.id] = len(self._group_index)
+        self._mark_changed()
         return group
     
+    @_synchronized
     def add_user_to_group(self, group_id: str, user_id: str) -> bool:
         """Add a user to a group"""
         if group_id not in self.groups or user_id not in self.users:
@@ -116,9 +329,11 @@ class ExpenseSplitter:
         
         group = self.groups[group_id]
         if user_id not in group.members:
-            group.members.append(user_id)
+            group.members[user_id] = None
+            self._mark_changed(group_id)
         return True
     
+    @_synchronized
     def remove_user_from_group(self, group_id: str, user_id: str) -> bool:
         """Remove a user from a group"""
         if group_id not in self.groups:
@@ -126,10 +341,12 @@ class ExpenseSplitter:
         
         group = self.groups[group_id]
         if user_id in group.members:
-            group.members.remove(user_id)
+            del group.members[user_id]
+            self._mark_changed(group_id)
         return True
     
     # Expense Management
+    @_synchronized
     def add_expense(self, description: str, amount: float, paid_by: str, 
                    group_id: Optional[str] = None, category: str = "General") -> Expense:
         """Add a new expense"""
@@ -141,63 +358,66 @@ class ExpenseSplitter:
         
         expense = Expense(
             description=description,
-            amount=amount,
+            amount_cents=_to_cents(amount),
             paid_by=paid_by,
             group_id=group_id,
             category=category
         )
         self.expenses[expense.id] = expense
+        self._expenses_by_payer.setdefault(paid_by, []).append(expense.id)
+        self._expenses_by_group.setdefault(group_id, []).append(expense.id)
+        self._mark_changed(group_id)
         return expense
     
+    @_synchronized
     def split_expense_equally(self, expense_id: str, user_ids: List[str]) -> bool:
         """Split an expense equally among specified users"""
         if expense_id not in self.expenses:
             return False
         
         expense = self.expenses[expense_id]
-        if not all(user_id in self.users for user_id in user_ids):
+        if not user_ids or not set(user_ids).issubset(self.users):
             return False
         
-        split_amount = expense.amount / len(user_ids)
-        expense.split_type = SplitType.EQUAL
-        expense.splits = [Split(user_id=uid, amount=split_amount) for uid in user_ids]
+        shares = _allocate_cents(expense.amount_cents, np.ones(len(user_ids)))
+        self._set_splits(expense, SplitType.EQUAL, user_ids, shares)
         return True
     
+    @_synchronized
     def split_expense_exact(self, expense_id: str, splits: Dict[str, float]) -> bool:
         """Split an expense with exact amounts for each user"""
         if expense_id not in self.expenses:
             return False
         
         expense = self.expenses[expense_id]
-        if not all(user_id in self.users for user_id in splits.keys()):
+        if not splits.keys() <= self.users.keys():
             return False
         
-        total_splits = sum(splits.values())
-        if abs(total_splits - expense.amount) > 0.01:  # Allow for small rounding errors
-            raise ValueError(f"Split amounts ({total_splits}) don't match expense amount ({expense.amount})")
+        split_cents = np.rint(np.fromiter(splits.values(), dtype=np.float64, count=len(splits)) * 100).astype(np.int64)
+        if int(split_cents.sum()) != expense.amount_cents:
+            raise ValueError(f"Split amounts ({_from_cents(int(split_cents.sum()))}) "
+                             f"don't match expense amount ({expense.amount})")
         
-        expense.split_type = SplitType.EXACT
-        expense.splits = [Split(user_id=uid, amount=amount) for uid, amount in splits.items()]
+        self._set_splits(expense, SplitType.EXACT, list(splits), split_cents)
         return True
     
+    @_synchronized
     def split_expense_percentage(self, expense_id: str, percentages: Dict[str, float]) -> bool:
         """Split an expense by percentage"""
         if expense_id not in self.expenses:
             return False
         
         expense = self.expenses[expense_id]
-        if not all(user_id in self.users for user_id in percentages.keys()):
+        if not percentages.keys() <= self.users.keys():
             return False
         
-        total_percentage = sum(percentages.values())
+        pcts = np.fromiter(percentages.values(), dtype=np.float64, count=len(percentages))
+        total_percentage = float(pcts.sum())
         if abs(total_percentage - 100.0) > 0.01:
             raise ValueError(f"Percentages must sum to 100%, got {total_percentage}%")
         
-        expense.split_type = SplitType.PERCENTAGE
-        expense.splits = []
-        for uid, percentage in percentages.items():
-            amount = (percentage / 100.0) * expense.amount
-            expense.splits.append(Split(user_id=uid, amount=amount, percentage=percentage))
+        shares = _allocate_cents(expense.amount_cents, pcts)
+        self._set_splits(expense, SplitType.PERCENTAGE, list(percentages), shares, pcts)
         return True
     
     # Balance Calculations
@@ -206,106 +426,116 @@ class ExpenseSplitter:
         if user_id not in self.users:
             return {}
         
-        balances = {}
+        split_user, split_payer, split_group, split_cents = self._split_arrays()
+        uid = self._user_index[user_id]
         
-        for expense in self.expenses.values():
-            # Filter by group if specified
-            if group_id and expense.group_id != group_id:
-                continue
-            
-            # Skip expenses with no splits
-            if not expense.splits:
-                continue
-            
-            # Calculate what this user owes for this expense
-            user_owes = 0.0
-            for split in expense.splits:
-                if split.user_id == user_id:
-                    user_owes = split.amount
-                    break
-            
-            # If this user paid the expense
-            if expense.paid_by == user_id:
-                # Others owe this user
-                for split in expense.splits:
-                    if split.user_id != user_id:
-                        other_user = split.user_id
-                        if other_user not in balances:
-                            balances[other_user] = 0.0
-                        balances[other_user] += split.amount
-            else:
-                # This user owes the person who paid
-                if user_owes > 0:
-                    payer = expense.paid_by
-                    if payer not in balances:
-                        balances[payer] = 0.0
-                    balances[payer] -= user_owes
+        # Filter by group if specified
+        group = self._group_index.get(group_id, -2) if group_id else _ALL_GROUPS
+        net, involved = _user_net_cents(split_user, split_payer, split_group, split_cents,
+                                        uid, group, len(self.user_ids))
+        
+        return {self.user_ids[i]: _from_cents(int(net[i])) for i in np.flatnonzero(involved)}
+    
+    @_synchronized
+    def _split_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Structure-of-arrays view of every split as (user, payer, group) indices and amount in cents.
         
-        return balances
+        Rebuilt lazily, only when the data has changed since the last call.
+        """
+        if self._split_arrays_version != self.version:
+            version = self.version
+            expenses = list(self.expenses.values())
+            counts = np.fromiter((len(e.split_user_ids) for e in expenses), dtype=np.int64, count=len(expenses))
+            payers = np.fromiter((self._user_index[e.paid_by] for e in expenses), dtype=np.int64, count=len(expenses))
+            groups = np.fromiter((self._group_index.get(e.group_id, -1) for e in expenses),
+                                 dtype=np.int64, count=len(expenses))
+            self._split_soa = (
+                np.fromiter((self._user_index[uid] for e in expenses for uid in e.split_user_ids),
+                            dtype=np.int64, count=int(counts.sum())),
+                np.repeat(payers, counts),
+                np.repeat(groups, counts),
+                np.concatenate([np.zeros(0, dtype=np.int64)] + [e.split_cents for e in expenses])
+            )
+            self._split_arrays_version = version
+        return self._split_soa
     
+    @_synchronized
     def get_group_balances(self, group_id: str) -> Dict[str, Dict[str, float]]:
-        """Get all balances within a group"""
+        """Get all balances within a group (cached until the group's members or expenses change)"""
         if group_id not in self.groups:
             return {}
+        member_cents = self._group_balance_cache.get(group_id)
+        if member_cents is None:
+            member_cents = self._group_balance_cents(group_id)
+            self._group_balance_cache[group_id] = member_cents
         
-        group = self.groups[group_id]
-        group_balances = {}
-        
-        for member_id in group.members:
-            group_balances[member_id] = self.calculate_user_balance(member_id, group_id)
+        # Build fresh dicts on every call so callers cannot modify the cached balances
+        return {member_id: {uid: _from_cents(cents) for uid, cents in others} for member_id, others in member_cents}
+    
+    def _group_balance_cents(self, group_id: str) -> Tuple[Tuple[str, Tuple[Tuple[str, int], ...]], ...]:
+        """Every member's balance with each other user in the group, in cents"""
+        # Accumulate every pairwise balance in a single pass over the group's expenses,
+        # instead of re-scanning all expenses once per member. This deliberately does not go
+        # through _user_net_cents: the kernel yields one member's balances per call, so it would
+        # take one full scan of the split arrays per member, where this loop only reads the group's own expenses
+        balances: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for expense_id in self._expenses_by_group.get(group_id, []):
+            expense = self.expenses[expense_id]
+            payer = expense.paid_by
+            payer_balances = balances[payer]
+            for uid, cents in zip(expense.split_user_ids, expense.split_cents.tolist()):
+                if uid == payer:
+                    continue
+                payer_balances[uid] += cents
+                if cents > 0:
+                    balances[uid][payer] -= cents
         
-        return group_balances
+        return tuple((member_id, tuple(balances.get(member_id, {}).items()))
+                     for member_id in self.groups[group_id].members)
     
+    @_synchronized
     def simplify_debts(self, balances: Dict[str, Dict[str, float]]) -> List[Dict]:
         """Simplify debts to minimize number of transactions"""
-        # Calculate net balance for each user
-        net_balances = {}
-        for user_id, user_balances in balances.items():
-            net_balances[user_id] = sum(user_balances.values())
+        # Calculate net balance for each user, in cents
+        net_balances = tuple(sorted(
+            (user_id, _to_cents(sum(user_balances.values()))) for user_id, user_balances in balances.items()
+        ))
         
-        # Separate creditors and debtors
-        creditors = {uid: amount for uid, amount in net_balances.items() if amount > 0.01}
-        debtors = {uid: -amount for uid, amount in net_balances.items() if amount < -0.01}
+        # The settlement depends only on the net balances, so identical inputs reuse the last answer
+        payments = self._simplify_cache.get(net_balances)
+        if payments is None:
+            payments = _settle(net_balances)
+            self._simplify_cache[net_balances] = payments
+            if len(self._simplify_cache) > _SIMPLIFY_CACHE_SIZE:
+                self._simplify_cache.popitem(last=False)
+        else:
+            self._simplify_cache.move_to_end(net_balances)
         
-        transactions = []
-        
-        # Match debtors with creditors
-        for debtor_id, debt_amount in debtors.items():
-            remaining_debt = debt_amount
-            
-            for creditor_id, credit_amount in list(creditors.items()):
-                if remaining_debt <= 0.01:
-                    break
-                
-                payment = min(remaining_debt, credit_amount)
-                
-                transactions.append({
-                    'from': debtor_id,
-                    'to': creditor_id,
-                    'amount': round(payment, 2)
-                })
-                
-                remaining_debt -= payment
-                creditors[creditor_id] -= payment
-                
-                if creditors[creditor_id] <= 0.01:
-                    del creditors[creditor_id]
-        
-        return transactions
+        return [{'from': debtor, 'to': creditor, 'amount': _from_cents(cents)} for debtor, creditor, cents in payments]
     
     # Utility Methods
-    def get_user_expenses(self, user_id: str) -> List[Expense]:
-        """Get all expenses involving a user"""
-        user_expenses = []
-        for expense in self.expenses.values():
-            if expense.paid_by == user_id or any(split.user_id == user_id for split in expense.splits):
-                user_expenses.append(expense)
-        return sorted(user_expenses, key=lambda x: x.created_at, reverse=True)
-    
-    def get_group_expenses(self, group_id: str) -> List[Expense]:
-        """Get all expenses for a group"""
-        group_expenses = [exp for exp in self.expenses.values() if exp.group_id == group_id]
-        return sorted(group_expenses, key=lambda x: x.created_at, reverse=True)
+    def get_user_expenses(self, user_id: str, limit: Optional[int] = None, offset: int = 0) -> List[Expense]:
+        """Get expenses involving a user, newest first (a page of `limit` after skipping `offset` if given)"""
+        user_expenses = [self.expenses[expense_id] for expense_id in self._user_expense_ids(user_id)]
+        return _newest_first(user_expenses, limit, offset)
+    
+    def count_user_expenses(self, user_id: str) -> int:
+        """Count expenses involving a user without building the list"""
+        return len(self._user_expense_ids(user_id))
+    
+    def get_total_paid(self, user_id: str) -> float:
+        """Get the total amount of all expenses paid by a user"""
+        total_cents = sum(self.expenses[expense_id].amount_cents for expense_id in self._expenses_by_payer.get(user_id, []))
+        return _from_cents(total_cents)
+    
+    def _user_expense_ids(self, user_id: str) -> Set[str]:
+        """Ids of expenses a user paid for or has a split in"""
+        return self._expenses_by_participant.get(user_id, set()).union(self._expenses_by_payer.get(user_id, []))
+    
+    def get_group_expenses(self, group_id: str, limit: Optional[int] = None) -> List[Expense]:
+        """Get expenses for a group, newest first (only the latest `limit` if given)"""
+        group_expenses = [self.expenses[expense_id] for expense_id in self._expenses_by_group.get(group_id, [])]
+        return _newest_first(group_expenses, limit)
 
 
 # Example usage
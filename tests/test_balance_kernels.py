@@ -0,0 +1,54 @@
+"""The NumPy and loop versions of the per-user balance kernel must agree.
+
+Only one of them runs in any given environment (the loop is compiled when Numba
+is installed), so they are compared directly here on the same split arrays.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main
+from main import _ALL_GROUPS, _user_net_cents_loop, _user_net_cents_numpy
+
+N_USERS = 6
+N_GROUPS = 3
+
+KERNELS = [_user_net_cents_loop]
+if main.njit is not None:
+    KERNELS.append(main._user_net_cents)
+
+
+def random_splits(seed, n_splits=200):
+    """Random split arrays, including zero-cent shares, self-paid splits and ungrouped (-1) expenses"""
+    rng = np.random.default_rng(seed)
+    split_user = rng.integers(0, N_USERS, n_splits)
+    split_payer = rng.integers(0, N_USERS, n_splits)
+    split_group = rng.integers(-1, N_GROUPS, n_splits)
+    split_cents = rng.integers(0, 5000, n_splits)
+    split_cents[rng.random(n_splits) < 0.2] = 0
+    return split_user, split_payer, split_group, split_cents
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("group", [_ALL_GROUPS, -2, -1] + list(range(N_GROUPS)))
+def test_kernels_agree(kernel, seed, group):
+    arrays = random_splits(seed)
+    for uid in range(N_USERS):
+        expected_net, expected_involved = _user_net_cents_numpy(*arrays, uid, group, N_USERS)
+        net, involved = kernel(*arrays, uid, group, N_USERS)
+        np.testing.assert_array_equal(net, expected_net)
+        np.testing.assert_array_equal(involved, expected_involved)
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_kernels_agree_without_splits(kernel):
+    empty = np.zeros(0, dtype=np.int64)
+    for candidate in (kernel, _user_net_cents_numpy):
+        net, involved = candidate(empty, empty, empty, empty, 0, _ALL_GROUPS, N_USERS)
+        assert net.dtype == np.int64 and not net.any()
+        assert not involved.any()